@@ -1,18 +1,57 @@
 from flask import Flask, render_template, request, jsonify
+import hashlib
 import json
+import logging
 import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from src.data_manager import DataManager
+from src.json_provider import OrjsonProvider
 from src.reward_calculator import RewardCalculator
 from src.scrapers.card_scraper import CardScraper
 
+logging.basicConfig(level=logging.INFO)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Initialize components
 data_manager = DataManager()
 reward_calculator = RewardCalculator()
 card_scraper = CardScraper()
 
+SPENDING_CATEGORIES = [
+    "groceries", "gas", "restaurants", "travel", "online_shopping",
+    "department_stores", "utilities", "insurance", "entertainment",
+    "streaming_services", "phone_bill", "other"
+]
+
+def body_etag(body: bytes) -> str:
+    """Compute an ETag from a response body"""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+# Pre-encoded bodies and ETags for read-only endpoints. The cards body is keyed
+# by the list DataManager returns, which is only replaced when a card changes.
+CATEGORIES_RESPONSE_BODY = app.json.dumps_bytes({"success": True, "categories": SPENDING_CATEGORIES})
+CATEGORIES_RESPONSE_ETAG = body_etag(CATEGORIES_RESPONSE_BODY)
+_cards_response_cache = {}
+
+# Scraping runs off the request thread, one job at a time; clients poll by job id.
+# Only the most recent jobs are remembered
+scraper_pool = ThreadPoolExecutor(max_workers=1)
+scrape_jobs = OrderedDict()
+scrape_jobs_lock = threading.Lock()
+MAX_SCRAPE_JOBS = 20
+
+def json_body_response(body: bytes, etag: str):
+    """Wrap an already-encoded JSON body in a response, answering 304 if the client's copy is current"""
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
 @app.route('/')
 def index():
     """Main dashboard page"""
@@ -23,7 +62,12 @@ def get_cards():
     """Get all available credit cards"""
     try:
         cards = data_manager.get_all_cards()
-        return jsonify({"success": True, "cards": cards})
+        cached = _cards_response_cache.get("cards")
+        if cached is None or cached[0] is not cards:
+            body = app.json.dumps_bytes({"success": True, "cards": cards})
+            cached = (cards, body, body_etag(body))
+            _cards_response_cache["cards"] = cached
+        return json_body_response(cached[1], cached[2])
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -54,12 +98,14 @@ def optimize_spending():
     """Calculate optimal spending strategy"""
     try:
         spending_data = request.json
-        user_cards = data_manager.get_user_cards()
+        preference = spending_data.get('preference', 'cashback')
+        user_cards, relevant_cards = data_manager.get_user_cards_with_type(preference)
         
         optimization = reward_calculator.optimize_spending(
             user_cards=user_cards,
             spending_categories=spending_data.get('categories', {}),
-            preference=spending_data.get('preference', 'cashback')
+            preference=preference,
+            relevant_cards=relevant_cards
         )
         
         return jsonify({
@@ -71,22 +117,44 @@ def optimize_spending():
 
 @app.route('/api/scrape/update', methods=['POST'])
 def update_card_data():
-    """Update credit card data via web scraping"""
+    """Start a background update of credit card data via web scraping"""
     try:
-        card_scraper.update_all_cards()
-        return jsonify({"success": True, "message": "Card data updated successfully"})
+        with scrape_jobs_lock:
+            # Hand back the job already in progress instead of queueing another scrape
+            for job_id, future in scrape_jobs.items():
+                if not future.done():
+                    return jsonify({"success": True, "job_id": job_id, "message": "Card data update already running"}), 202
+            
+            job_id = uuid.uuid4().hex
+            scrape_jobs[job_id] = scraper_pool.submit(card_scraper.update_all_cards)
+            while len(scrape_jobs) > MAX_SCRAPE_JOBS:
+                scrape_jobs.popitem(last=False)
+        
+        return jsonify({"success": True, "job_id": job_id, "message": "Card data update started"}), 202
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/api/scrape/status/<job_id>', methods=['GET'])
+def scrape_status(job_id):
+    """Get the status of a background card data update"""
+    with scrape_jobs_lock:
+        future = scrape_jobs.get(job_id)
+    if future is None:
+        return jsonify({"success": False, "error": "Unknown job id"}), 404
+    
+    if not future.done():
+        return jsonify({"success": True, "status": "running"})
+    
+    error = future.exception()
+    if error is not None:
+        return jsonify({"success": False, "status": "failed", "error": str(error)})
+    
+    return jsonify({"success": True, "status": "completed", "message": "Card data updated successfully"})
+
 @app.route('/api/categories', methods=['GET'])
 def get_spending_categories():
     """Get available spending categories"""
-    categories = [
-        "groceries", "gas", "restaurants", "travel", "online_shopping",
-        "department_stores", "utilities", "insurance", "entertainment",
-        "streaming_services", "phone_bill", "other"
-    ]
-    return jsonify({"success": True, "categories": categories})
+    return json_body_response(CATEGORIES_RESPONSE_BODY, CATEGORIES_RESPONSE_ETAG)
 
 if __name__ == '__main__':
     # Ensure data directories exist
@@ -1,7 +1,12 @@
-import json
+import atexit
+import copy
 import os
-from typing import Dict, List, Any
-from datetime import datetime
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+import orjson
+
+from src.timestamps import iso_now
 
 class DataManager:
     """Manages all data operations for Card Compass"""
@@ -11,6 +16,27 @@ class DataManager:
         self.cards_file = os.path.join(self.data_dir, "credit_cards.json")
         self.user_cards_file = os.path.join(self.data_dir, "user_cards.json")
         self.user_preferences_file = os.path.join(self.data_dir, "user_preferences.json")
+        
+        # Decoded JSON keyed by file path, validated against the file's mtime
+        self._cache: Dict[str, Tuple[int, Any]] = {}
+        self._lock = threading.RLock()
+        
+        # Orders file writes so an older snapshot never lands after a newer
+        # one; always taken before _lock, and never held by readers
+        self._write_lock = threading.RLock()
+        
+        # Cards and user cards live in memory once loaded, keyed by card id in
+        # insertion order; writes are coalesced into a single delayed flush so
+        # bursts of updates cost one file write
+        self._cards: Optional[Dict[str, Dict[str, Any]]] = None
+        self._cards_list: Optional[List[Dict[str, Any]]] = None
+        self._user_cards: Optional[Dict[str, Dict[str, Any]]] = None
+        self._user_cards_list: Optional[List[Dict[str, Any]]] = None
+        self._user_cards_by_type: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._dirty_files = set()
+        self._flush_timer: Optional[threading.Timer] = None
+        self.flush_delay = 0.1  # seconds
+        atexit.register(self._flush_now)
     
     def initialize_data_files(self):
         """Initialize data files with default data if they don't exist"""
@@ -19,51 +45,112 @@ class DataManager:
         # Initialize credit cards data
         if not os.path.exists(self.cards_file):
             default_cards = self._get_default_cards_data()
-            self._save_json(self.cards_file, default_cards)
+            self._save_json(self.cards_file, default_cards, pretty=True)
         
         # Initialize user cards
         if not os.path.exists(self.user_cards_file):
-            self._save_json(self.user_cards_file, [])
+            self._save_json(self.user_cards_file, [], pretty=True)
         
         # Initialize user preferences
         if not os.path.exists(self.user_preferences_file):
             default_preferences = {
                 "reward_preference": "cashback",
                 "monthly_spending": {},
-                "created_at": datetime.now().isoformat()
+                "created_at": iso_now()
             }
-            self._save_json(self.user_preferences_file, default_preferences)
+            self._save_json(self.user_preferences_file, default_preferences, pretty=True)
     
     def get_all_cards(self) -> List[Dict[str, Any]]:
-        """Get all available credit cards"""
-        return self._load_json(self.cards_file)
+        """Get all available credit cards
+        
+        As with get_user_cards, the same list is returned until a card changes.
+        """
+        with self._lock:
+            if self._cards_list is None:
+                self._cards_list = list(self._get_cards_by_id().values())
+            return self._cards_list
     
     def get_user_cards(self) -> List[Dict[str, Any]]:
-        """Get user's credit cards"""
-        return self._load_json(self.user_cards_file)
+        """Get user's credit cards
+        
+        The same list is returned until the collection changes, then a new
+        one is built, so callers always hold a consistent snapshot.
+        """
+        with self._lock:
+            if self._user_cards_list is None:
+                self._user_cards_list = list(self._get_user_cards_by_id().values())
+            return self._user_cards_list
+    
+    def get_user_cards_by_type(self, card_type: str) -> List[Dict[str, Any]]:
+        """Get user's cards of a reward type ('cashback' or 'points')
+        
+        Any other type returns all of the user's cards. The lists are built
+        once per change to the collection and shared between callers.
+        """
+        with self._lock:
+            if card_type not in ("cashback", "points"):
+                return self.get_user_cards()
+            
+            if self._user_cards_by_type is None:
+                by_type = {"cashback": [], "points": []}
+                for card in self.get_user_cards():
+                    if card.get('type') in by_type:
+                        by_type[card['type']].append(card)
+                self._user_cards_by_type = by_type
+            return self._user_cards_by_type[card_type]
+    
+    def get_user_cards_with_type(self, card_type: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Get user's cards together with those of a reward type, from one snapshot
+        
+        Both lists come from the same state of the collection, so the typed
+        list is always a subset of the full one.
+        """
+        with self._lock:
+            return self.get_user_cards(), self.get_user_cards_by_type(card_type)
     
     def add_user_card(self, card_data: Dict[str, Any]):
         """Add a credit card to user's collection"""
-        user_cards = self.get_user_cards()
-        card_data['added_at'] = datetime.now().isoformat()
-        user_cards.append(card_data)
-        self._save_json(self.user_cards_file, user_cards)
+        card_data['added_at'] = iso_now()
+        with self._lock:
+            self._get_user_cards_by_id()[card_data.get('id')] = card_data
+            self._user_cards_changed()
     
     def remove_user_card(self, card_id: str):
         """Remove a credit card from user's collection"""
-        user_cards = self.get_user_cards()
-        user_cards = [card for card in user_cards if card.get('id') != card_id]
-        self._save_json(self.user_cards_file, user_cards)
+        with self._lock:
+            if self._get_user_cards_by_id().pop(card_id, None) is not None:
+                self._user_cards_changed()
+    
+    def _get_user_cards_by_id(self) -> Dict[str, Dict[str, Any]]:
+        """Get the in-memory user cards keyed by id, loading them on first use"""
+        with self._lock:
+            if self._user_cards is None:
+                user_cards = self._load_json(self.user_cards_file, mutable=True)
+                self._user_cards = {card.get('id'): card for card in user_cards}
+            return self._user_cards
+    
+    def _get_cards_by_id(self) -> Dict[str, Dict[str, Any]]:
+        """Get the in-memory available cards keyed by id, loading them on first use"""
+        with self._lock:
+            if self._cards is None:
+                cards = self._load_json(self.cards_file, mutable=True)
+                self._cards = {card.get('id'): card for card in cards}
+            return self._cards
     
     def update_card_data(self, card_id: str, updated_data: Dict[str, Any]):
         """Update credit card data"""
-        cards = self.get_all_cards()
-        for i, card in enumerate(cards):
-            if card.get('id') == card_id:
-                cards[i].update(updated_data)
-                cards[i]['updated_at'] = datetime.now().isoformat()
-                break
-        self._save_json(self.cards_file, cards)
+        with self._lock:
+            cards = self._get_cards_by_id()
+            if card_id not in cards:
+                return
+            
+            # Update a copy so lists already handed out stay unchanged
+            card = dict(cards[card_id])
+            card.update(updated_data)
+            card['updated_at'] = iso_now()
+            cards[card_id] = card
+            self._cards_list = None
+            self._schedule_flush(self.cards_file)
     
     def get_user_preferences(self) -> Dict[str, Any]:
         """Get user preferences"""
@@ -71,26 +158,101 @@ class DataManager:
     
     def update_user_preferences(self, preferences: Dict[str, Any]):
         """Update user preferences"""
-        current_prefs = self.get_user_preferences()
+        current_prefs = self._load_json(self.user_preferences_file, mutable=True)
         current_prefs.update(preferences)
-        current_prefs['updated_at'] = datetime.now().isoformat()
+        current_prefs['updated_at'] = iso_now()
         self._save_json(self.user_preferences_file, current_prefs)
     
-    def _load_json(self, file_path: str) -> Any:
-        """Load JSON data from file"""
+    def _user_cards_changed(self):
+        """Drop the derived user card views and schedule a flush"""
+        self._user_cards_list = None
+        self._user_cards_by_type = None
+        self._schedule_flush(self.user_cards_file)
+    
+    def _schedule_flush(self, file_path: str):
+        """Mark a file dirty and flush pending changes once the delay elapses"""
+        with self._lock:
+            self._dirty_files.add(file_path)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_delay, self._flush_now)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def _flush_now(self):
+        """Write pending card and user card changes to disk
+        
+        The data is snapshotted under the lock, but written outside it, so
+        readers never wait on the disk.
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                
+                # The lists are replaced rather than modified when cards
+                # change, so they stay consistent while being written
+                pending = []
+                if self.cards_file in self._dirty_files:
+                    pending.append((self.cards_file, self.get_all_cards()))
+                if self.user_cards_file in self._dirty_files:
+                    pending.append((self.user_cards_file, self.get_user_cards()))
+                self._dirty_files.clear()
+            
+            for file_path, data in pending:
+                self._save_json(file_path, data)
+    
+    def _load_json(self, file_path: str, mutable: bool = False) -> Any:
+        """Load JSON data from file, reusing the cached copy while the file is unchanged
+        
+        Callers that modify the result before saving should pass mutable=True so
+        they get a private copy instead of the shared cached object.
+        """
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            mtime = os.stat(file_path).st_mtime_ns
+        except FileNotFoundError:
             return []
+        
+        with self._lock:
+            cached = self._cache.get(file_path)
+            if cached is not None and cached[0] == mtime:
+                data = cached[1]
+            else:
+                try:
+                    with open(file_path, 'rb') as f:
+                        data = orjson.loads(f.read())
+                except (FileNotFoundError, orjson.JSONDecodeError):
+                    return []
+                self._cache[file_path] = (mtime, data)
+        
+        return copy.deepcopy(data) if mutable else data
     
-    def _save_json(self, file_path: str, data: Any):
-        """Save data to JSON file"""
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+    def _save_json(self, file_path: str, data: Any, pretty: bool = False):
+        """Save data to JSON file, compact unless pretty output is requested"""
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+        
+        with self._write_lock:
+            # Write the whole payload to a temp file in one call, then swap it
+            # into place so readers never see a partially written file
+            tmp_path = file_path + '.tmp'
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, file_path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            mtime = os.stat(file_path).st_mtime_ns
+            
+            with self._lock:
+                self._cache[file_path] = (mtime, data)
     
     def _get_default_cards_data(self) -> List[Dict[str, Any]]:
         """Get default credit cards data"""
+        now_iso = iso_now()
         return [
             {
                 "id": "chase_freedom_unlimited",
@@ -108,7 +270,7 @@ class DataManager:
                     "amount": 200,
                     "requirement": "Spend $500 in first 3 months"
                 },
-                "updated_at": datetime.now().isoformat()
+                "updated_at": now_iso
             },
             {
                 "id": "chase_sapphire_preferred",
@@ -128,7 +290,7 @@ class DataManager:
                     "amount": 60000,
                     "requirement": "Spend $4,000 in first 3 months"
                 },
-                "updated_at": datetime.now().isoformat()
+                "updated_at": now_iso
             },
             {
                 "id": "discover_it_cash_back",
@@ -153,7 +315,7 @@ class DataManager:
                     "amount": "Double cash back first year",
                     "requirement": "No minimum spend"
                 },
-                "updated_at": datetime.now().isoformat()
+                "updated_at": now_iso
             },
             {
                 "id": "amex_gold",
@@ -173,6 +335,6 @@ class DataManager:
                     "amount": 60000,
                     "requirement": "Spend $4,000 in first 6 months"
                 },
-                "updated_at": datetime.now().isoformat()
+                "updated_at": now_iso
             }
         ]
@@ -0,0 +1,27 @@
+from typing import Any, Union
+
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson"""
+    
+    options = orjson.OPT_NON_STR_KEYS
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data to a JSON string"""
+        return orjson.dumps(obj, option=self.options).decode()
+    
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Serialize data to JSON bytes, ready to use as a response body"""
+        return orjson.dumps(obj, option=self.options)
+    
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize a JSON string or bytes"""
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Build a JSON response straight from orjson's bytes output"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype="application/json")
@@ -1,7 +1,22 @@
-from typing import Dict, List, Any, Tuple
+import threading
+from typing import Dict, FrozenSet, List, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
 import calendar
 
+import orjson
+
+def _score_rate_matrix(rate_matrix: List[List[float]], 
+                       amounts: List[float]) -> Tuple[List[float], List[float]]:
+    """Numeric core of the optimizer
+    
+    Scales a card x category rate matrix by the spending amounts and reduces it
+    to each card's total reward and each category's best reward.
+    """
+    reward_matrix = [[rate * amount for rate, amount in zip(row, amounts)] for row in rate_matrix]
+    card_totals = [sum(card_rewards) for card_rewards in reward_matrix]
+    category_best = [max(column) for column in zip(*reward_matrix)] or [0] * len(amounts)
+    return card_totals, category_best
+
 class RewardCalculator:
     """Calculates optimal credit card usage for maximum rewards"""
     
@@ -17,9 +32,31 @@ class RewardCalculator:
             "streaming_services": ["streaming", "entertainment"],
             "phone_bill": ["phone", "telecommunications"]
         }
+        
+        # Word sets for each category variation and rotating schedule entry, so
+        # rotating matches are set comparisons instead of substring scans; the
+        # rotating cache is only ever added to, so unlocked readers are safe
+        self._variation_tokens: Dict[str, List[FrozenSet[str]]] = {
+            category: [self._tokenize(variation) for variation in variations]
+            for category, variations in self.category_mapping.items()
+        }
+        self._rotating_tokens: Dict[str, FrozenSet[str]] = {}
+        
+        # [{category: reward per dollar}] by card position, rebuilt when the
+        # cards' contents or the quarter change
+        self._rate_index: List[Dict[str, float]] = []
+        self._rate_index_fingerprint: Optional[bytes] = None
+        self._rate_index_quarter = None
+        
+        # {category: [(card position, reward per dollar), ...]} best first, built lazily per index
+        self._category_rankings: Dict[str, List[Tuple[int, float]]] = {}
+        
+        # Guards the cached index and rankings when requests run concurrently
+        self._lock = threading.RLock()
     
     def optimize_spending(self, user_cards: List[Dict], spending_categories: Dict[str, float], 
-                         preference: str = "cashback") -> Dict[str, Any]:
+                         preference: str = "cashback", 
+                         relevant_cards: List[Dict] = None) -> Dict[str, Any]:
         """
         Calculate optimal spending strategy for maximum rewards
         
@@ -27,6 +64,7 @@ class RewardCalculator:
             user_cards: List of user's credit cards
             spending_categories: Dict of category -> monthly spending amount
             preference: 'cashback' or 'points'
+            relevant_cards: user_cards already filtered by preference, if available
         
         Returns:
             Optimization results with recommendations
@@ -38,29 +76,45 @@ class RewardCalculator:
             }
         
         # Filter cards by preference
-        relevant_cards = self._filter_cards_by_preference(user_cards, preference)
+        if relevant_cards is None:
+            relevant_cards = self._filter_cards_by_preference(user_cards, preference)
+        current_quarter = self._get_current_quarter()
+        categories = [category for category, amount in spending_categories.items() if amount > 0]
+        amounts = [spending_categories[category] for category in categories]
+        
+        # Only fetching the shared rate index and rankings needs the lock; both
+        # are replaced rather than modified once built, so the snapshots taken
+        # here stay valid while the rest of the request runs unlocked
+        with self._lock:
+            rate_index = self._get_rate_index(user_cards, current_quarter)
+            rankings = [self._get_category_ranking(user_cards, category) for category in categories]
         
-        # Calculate rewards for each category
+        # Score the card x category matrix once over all cards for recommendations
+        all_rate_matrix = self._build_rate_matrix(user_cards, categories, rate_index, current_quarter)
+        card_totals, category_best = _score_rate_matrix(all_rate_matrix, amounts)
+        
+        # Pick the best preferred card for each category
         category_optimizations = {}
         total_rewards = 0
+        relevant_ids = {id(card) for card in relevant_cards}
         
-        for category, amount in spending_categories.items():
-            if amount > 0:
-                best_card, reward_amount = self._find_best_card_for_category(
-                    relevant_cards, category, amount
-                )
-                
-                category_optimizations[category] = {
-                    "amount": amount,
-                    "best_card": best_card,
-                    "reward_amount": reward_amount,
-                    "reward_rate": reward_amount / amount if amount > 0 else 0
-                }
-                total_rewards += reward_amount
+        for category, amount, ranking in zip(categories, amounts, rankings):
+            best_card, reward_amount = self._find_best_card_for_category(
+                user_cards, relevant_cards, relevant_ids, ranking, amount
+            )
+        
+            category_optimizations[category] = {
+                "amount": amount,
+                "best_card": best_card,
+                "reward_amount": reward_amount,
+                "reward_rate": reward_amount / amount if amount > 0 else 0
+            }
+            total_rewards += reward_amount
         
         # Generate recommendations
         recommendations = self._generate_recommendations(
-            category_optimizations, user_cards, preference
+            category_optimizations, user_cards, preference, current_quarter,
+            card_totals, category_best, categories
         )
         
         # Calculate monthly and annual projections
@@ -85,57 +139,140 @@ class RewardCalculator:
         else:
             return cards
     
-    def _find_best_card_for_category(self, cards: List[Dict], category: str, 
+    def _find_best_card_for_category(self, all_cards: List[Dict], cards: List[Dict], 
+                                   card_ids: Set[int], ranking: List[Tuple[int, float]], 
                                    amount: float) -> Tuple[Dict, float]:
-        """Find the best credit card for a specific spending category"""
-        best_card = None
-        max_reward = 0
+        """Find the best of `cards` for a category by walking its ranking of `all_cards`
         
-        for card in cards:
-            reward_amount = self._calculate_reward_for_category(card, category, amount)
-            
-            if reward_amount > max_reward:
-                max_reward = reward_amount
-                best_card = card
+        The ranking is sorted best first, so the first eligible entry wins and
+        the rest of the cards are never looked at.
+        """
+        if not cards:
+            return None, 0
+        
+        for position, rate in ranking:
+            if id(all_cards[position]) in card_ids:
+                if rate * amount > 0:
+                    return all_cards[position], rate * amount
+                break
+        
+        # If no card earns anything, default to the first card's base rate
+        return cards[0], self._calculate_base_reward(cards[0], amount)
+    
+    def _get_category_ranking(self, cards: List[Dict], category: str) -> List[Tuple[int, float]]:
+        """Get the cards ranked by reward per dollar for a category, best first
         
-        # If no specific category match, use base rate
-        if best_card is None and cards:
-            best_card = cards[0]  # Default to first card
-            max_reward = self._calculate_base_reward(best_card, amount)
+        `cards` must be the list the current rate index was built for, and the
+        caller must hold the lock.
+        """
+        ranking = self._category_rankings.get(category)
+        if ranking is None:
+            rates = [
+                self._lookup_rate(self._rate_index, position, card, category, self._rate_index_quarter)
+                for position, card in enumerate(cards)
+            ]
+            # sorted() is stable, so ties keep the cards' original order
+            order = sorted(range(len(cards)), key=rates.__getitem__, reverse=True)
+            ranking = self._category_rankings[category] = [(i, rates[i]) for i in order]
+        return ranking
+    
+    def _build_rate_matrix(self, cards: List[Dict], categories: List[str], 
+                           rate_index: List[Dict[str, float]], 
+                           current_quarter: str) -> List[List[float]]:
+        """Build a card x category matrix of reward per dollar from the rate index"""
+        return [
+            [self._lookup_rate(rate_index, position, card, category, current_quarter) for category in categories]
+            for position, card in enumerate(cards)
+        ]
+    
+    def _get_rate_index(self, cards: List[Dict], current_quarter: str) -> List[Dict[str, float]]:
+        """Return the rate index for a cards list, rebuilding it only when the cards change
+        
+        The cached index is validated against a serialized snapshot of the
+        cards, which is far cheaper than rebuilding it and also catches cards
+        edited in place.
+        """
+        try:
+            fingerprint = orjson.dumps(cards)
+        except TypeError:
+            # Cards that cannot be serialized are never matched to the cache
+            fingerprint = None
+        
+        if (fingerprint is None or fingerprint != self._rate_index_fingerprint
+                or current_quarter != self._rate_index_quarter):
+            self._rate_index = self._build_rate_index(cards, current_quarter)
+            self._rate_index_fingerprint = fingerprint
+            self._rate_index_quarter = current_quarter
+            self._category_rankings = {}
+        
+        return self._rate_index
+    
+    def _build_rate_index(self, cards: List[Dict], current_quarter: str) -> List[Dict[str, float]]:
+        """Precompute the reward per dollar of every card for every known category, by card position"""
+        index = []
+        for card in cards:
+            card_categories = card.get("rewards", {}).get("categories", {})
+            index.append({
+                category: self._reward_multiplier(card, category, current_quarter)
+                for category in set(self.category_mapping) | set(card_categories)
+            })
+        return index
+    
+    def _lookup_rate(self, rate_index: List[Dict[str, float]], position: int, card: Dict, 
+                     category: str, current_quarter: str) -> float:
+        """Look up a card's reward per dollar, computing categories the index does not cover
         
-        return best_card, max_reward
+        The index is shared between requests, so it is only read here, never filled in.
+        """
+        rate = rate_index[position].get(category)
+        if rate is None:
+            rate = self._reward_multiplier(card, category, current_quarter)
+        return rate
     
-    def _calculate_reward_for_category(self, card: Dict, category: str, 
-                                     amount: float) -> float:
-        """Calculate reward amount for a specific category and card"""
+    def _reward_multiplier(self, card: Dict, category: str, current_quarter: str) -> float:
+        """Reward earned per dollar spent in a category, already scaled for cashback cards"""
         rewards = card.get("rewards", {})
         categories = rewards.get("categories", {})
+        is_cashback = card.get("type") == "cashback"
         
         # Check for direct category match
         if category in categories:
             rate = categories[category]
-            return amount * (rate / 100) if card.get("type") == "cashback" else amount * rate
+            return rate / 100 if is_cashback else rate
         
         # Check for mapped category matches
         category_variations = self.category_mapping.get(category, [category])
         for variation in category_variations:
             if variation in categories:
                 rate = categories[variation]
-                return amount * (rate / 100) if card.get("type") == "cashback" else amount * rate
+                return rate / 100 if is_cashback else rate
         
         # Check for rotating categories (like Discover)
         if "rotating_5x" in categories:
-            current_quarter = self._get_current_quarter()
             rotating_schedule = rewards.get("rotating_schedule", {})
             
             if current_quarter in rotating_schedule:
-                rotating_category = rotating_schedule[current_quarter]
-                if any(cat in rotating_category.lower() for cat in category_variations):
+                rotating_tokens = self._get_rotating_tokens(rotating_schedule[current_quarter])
+                variation_tokens = self._variation_tokens.get(category) or [self._tokenize(category)]
+                if any(tokens <= rotating_tokens for tokens in variation_tokens):
                     rate = categories["rotating_5x"]
-                    return amount * (rate / 100) if card.get("type") == "cashback" else amount * rate
+                    return rate / 100 if is_cashback else rate
         
         # Fall back to base rate
-        return self._calculate_base_reward(card, amount)
+        base_rate = rewards.get("base_rate", 1)
+        return base_rate / 100 if is_cashback else base_rate
+    
+    def _get_rotating_tokens(self, rotating_category: str) -> FrozenSet[str]:
+        """Get the cached word set of a rotating schedule entry"""
+        tokens = self._rotating_tokens.get(rotating_category)
+        if tokens is None:
+            tokens = self._rotating_tokens[rotating_category] = self._tokenize(rotating_category)
+        return tokens
+    
+    @staticmethod
+    def _tokenize(name: str) -> FrozenSet[str]:
+        """Split a snake_case category name into its lowercase words"""
+        return frozenset(name.lower().replace("_", " ").split())
     
     def _calculate_base_reward(self, card: Dict, amount: float) -> float:
         """Calculate reward using base rate"""
@@ -159,12 +296,16 @@ class RewardCalculator:
             return "Q4"
     
     def _generate_recommendations(self, optimizations: Dict, all_cards: List[Dict], 
-                                preference: str) -> List[Dict]:
+                                preference: str, current_quarter: str,
+                                card_totals: List[float], category_best: List[float], 
+                                categories: List[str]) -> List[Dict]:
         """Generate personalized recommendations"""
         recommendations = []
         
         # Recommendation 1: Missing high-reward categories
-        missing_categories = self._find_missing_high_reward_categories(optimizations, all_cards)
+        missing_categories = self._find_missing_high_reward_categories(
+            optimizations, category_best, categories
+        )
         if missing_categories:
             recommendations.append({
                 "type": "missing_categories",
@@ -174,12 +315,12 @@ class RewardCalculator:
             })
         
         # Recommendation 2: Annual fee optimization
-        fee_recommendation = self._analyze_annual_fees(optimizations, all_cards)
+        fee_recommendation = self._analyze_annual_fees(optimizations, all_cards, card_totals)
         if fee_recommendation:
             recommendations.append(fee_recommendation)
         
         # Recommendation 3: Rotating category optimization
-        rotating_rec = self._check_rotating_categories(optimizations)
+        rotating_rec = self._check_rotating_categories(optimizations, current_quarter)
         if rotating_rec:
             recommendations.append(rotating_rec)
         
@@ -191,41 +332,34 @@ class RewardCalculator:
         return recommendations
     
     def _find_missing_high_reward_categories(self, optimizations: Dict, 
-                                           all_cards: List[Dict]) -> List[str]:
+                                           category_best: List[float], 
+                                           categories: List[str]) -> List[str]:
         """Find categories where user could get better rewards"""
         missing = []
         
-        for category, data in optimizations.items():
+        for j, category in enumerate(categories):
+            data = optimizations[category]
             current_rate = data.get("reward_rate", 0)
             
-            # Check if there are better cards available for this category
-            for card in all_cards:
-                potential_reward = self._calculate_reward_for_category(
-                    card, category, data["amount"]
-                )
-                potential_rate = potential_reward / data["amount"] if data["amount"] > 0 else 0
-                
-                if potential_rate > current_rate * 1.5:  # 50% better
-                    missing.append(category)
-                    break
+            # Compare against the best reward any of the user's cards could earn here
+            potential_reward = category_best[j]
+            potential_rate = potential_reward / data["amount"] if data["amount"] > 0 else 0
+            
+            if potential_rate > current_rate * 1.5:  # 50% better
+                missing.append(category)
         
         return missing
     
-    def _analyze_annual_fees(self, optimizations: Dict, all_cards: List[Dict]) -> Dict:
+    def _analyze_annual_fees(self, optimizations: Dict, all_cards: List[Dict], 
+                             card_totals: List[float]) -> Dict:
         """Analyze if paying annual fees would be worth it"""
         total_annual_rewards = sum(data["reward_amount"] * 12 for data in optimizations.values())
         
         # Check for premium cards that might be worth the fee
-        for card in all_cards:
+        for card, card_total in zip(all_cards, card_totals):
             annual_fee = card.get("annual_fee", 0)
             if annual_fee > 0:
-                # Calculate potential rewards with this card
-                potential_rewards = 0
-                for category, data in optimizations.items():
-                    reward = self._calculate_reward_for_category(card, category, data["amount"])
-                    potential_rewards += reward
-                
-                annual_potential = potential_rewards * 12
+                annual_potential = card_total * 12
                 net_benefit = annual_potential - total_annual_rewards - annual_fee
                 
                 if net_benefit > 100:  # At least $100 net benefit
@@ -238,10 +372,8 @@ class RewardCalculator:
         
         return None
     
-    def _check_rotating_categories(self, optimizations: Dict) -> Dict:
+    def _check_rotating_categories(self, optimizations: Dict, current_quarter: str) -> Dict:
         """Check for rotating category opportunities"""
-        current_quarter = self._get_current_quarter()
-        
         # This is a simplified check - in a real app, you'd have more detailed data
         return {
             "type": "rotating",
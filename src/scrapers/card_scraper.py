@@ -1,266 +1,511 @@
 import requests
-from bs4 import BeautifulSoup
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from lxml import etree
+import lxml.html
+import orjson
+import functools
+import multiprocessing
+import os
+import re
+import shelve
+import sys
+import threading
 import time
-from typing import Dict, List, Any
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Hashable, List, Any, Optional, Tuple
+from urllib.parse import urlparse
 import logging
 
+from src.timestamps import iso_now
+
+logger = logging.getLogger(__name__)
+
+def _build_session() -> requests.Session:
+    """Create the HTTP session shared by all scrapers
+    
+    Pooled keep-alive connections let repeated requests to the same issuer
+    hosts skip the TCP and TLS handshakes.
+    """
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        # Ask for compressed HTML; ACCEPT_ENCODING only offers br when a
+        # brotli decoder is installed, so every encoding it lists can be decoded
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'Accept': 'text/html,application/xhtml+xml'
+    })
+    
+    # Transient failures (rate limiting, 5xx) are retried a few times with a
+    # short exponential backoff. Retries sleep while the request holds a shared
+    # fetch slot, so Retry-After is ignored and the total backoff stays under
+    # a few seconds; a host that is still throttling just fails this pass
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=False
+    )
+    # pool_maxsize must stay >= MAX_CONCURRENT_FETCHES so every fetch thread
+    # can keep its own connection alive; pool_block=False means a burst past
+    # it opens an extra connection instead of waiting for a free one
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        pool_block=False,
+        max_retries=retries
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+_SESSION = _build_session()
+
+# Upper bound on card pages being fetched at once, across all issuers; keep
+# it at or below the session's pool_maxsize so fetches never contend for
+# pooled connections
+MAX_CONCURRENT_FETCHES = 15
+
+# Selectors for the card details on issuer pages, compiled once at import
+_FEE_XP = etree.XPath("//*[contains(@class, 'annual-fee')]//text()")
+_BONUS_XP = etree.XPath("//*[contains(@class, 'signup-bonus')]//text()")
+_RATE_XP = etree.XPath("//*[contains(@class, 'rewards')]//li")
+
+# Patterns for the text the selectors pick out, compiled once at import
+_MONEY_RE = re.compile(r'\$([\d,]+)')
+_AMOUNT_RE = re.compile(r'\$?(\d[\d,]*)')
+_SPEND_RE = re.compile(r'(spend \$[\d,]+.*)', re.I)
+_RATE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*[x%](?:\s+[\w-]+){0,3}?\s+(?:on|at)\s+(.+)', re.I)
+_PHRASE_END_RE = re.compile(r'[(,;]')
+_WORD_RE = re.compile(r'[a-z]+')
+
+# Words that end the category part of a rate phrase ("dining at restaurants"),
+# and words that never name a category ("select", "eligible")
+_QUALIFIER_WORDS = frozenset({
+    'and', 'at', 'for', 'from', 'in', 'including', 'on', 'purchased', 'through', 'via', 'when', 'with'
+})
+_FILLER_WORDS = frozenset({'eligible', 'other', 'qualifying', 'select', 'us'})
+
+# Fields every scraped card must have to be stored
+_REQUIRED_CARD_FIELDS = frozenset({'id', 'name', 'issuer', 'type', 'rewards'})
+
+# Largest page body read before a fetch is abandoned
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+# Upper bound on page parsing worker processes
+MAX_PARSE_WORKERS = 4
+
+CATALOG_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "cards_catalog.json")
+
+@functools.lru_cache(maxsize=1)
+def _load_catalog() -> Dict[str, List[Dict[str, Any]]]:
+    """Load the static card catalog once, keyed by issuer
+    
+    The returned cards are shared; copy a card before modifying it.
+    """
+    with open(CATALOG_FILE, 'rb') as f:
+        catalog = orjson.loads(f.read())
+    
+    for cards in catalog.values():
+        for card in cards:
+            _intern_card(card)
+    return catalog
+
+def _intern_card(card: Dict[str, Any]):
+    """Intern a card's issuer, type and reward category names in place
+    
+    These come from small vocabularies repeated across every card, so all
+    cards end up sharing one string object per value.
+    """
+    for field in ('issuer', 'type'):
+        if isinstance(card.get(field), str):
+            card[field] = sys.intern(card[field])
+    
+    rewards = card.get('rewards')
+    if isinstance(rewards, dict) and isinstance(rewards.get('categories'), dict):
+        rewards['categories'] = {
+            sys.intern(category): rate for category, rate in rewards['categories'].items()
+        }
+
+def _category_slug(phrase: str) -> Optional[str]:
+    """Reduce a rate phrase such as "dining at restaurants" to a category key like "dining"
+    
+    The first run of words before a qualifier names the category; if it is
+    only filler ("eligible purchases at gas stations") the next run is used.
+    Returns None if no category words are found.
+    """
+    words = _WORD_RE.findall(_PHRASE_END_RE.split(phrase, 1)[0].lower().replace('.', ''))
+    
+    segment = []
+    for word in words + ['and']:
+        if word in _QUALIFIER_WORDS:
+            # Trailing "purchases" is noise, except in "all purchases"
+            if segment and segment[-1] in ('purchase', 'purchases') and segment[0] != 'all':
+                segment.pop()
+            if segment:
+                return '_'.join(segment)
+        elif word not in _FILLER_WORDS:
+            segment.append(word)
+    return None
+
+def _parse_and_extract(body: bytes, card_name: str) -> Dict[str, Any]:
+    """Parse a card page and extract its details
+    
+    Module-level so it can be pickled and run in the parsing process pool.
+    lxml's own errors carry an unpicklable error log, so a page that cannot
+    be parsed is reported as a plain ValueError.
+    """
+    try:
+        tree = lxml.html.fromstring(body)
+    except etree.LxmlError as e:
+        raise ValueError(str(e)) from None
+    return {
+        "rewards": CardScraper._extract_reward_rates(tree, card_name),
+        "annual_fee": CardScraper._extract_annual_fee(tree),
+        "sign_up_bonus": CardScraper._extract_signup_bonus(tree)
+    }
+
+class _HostRateLimiter:
+    """Spaces out requests to each host by at least `interval` seconds
+    
+    Only the part of the interval that has not already elapsed is waited out,
+    and hosts are tracked independently so one issuer never delays another.
+    """
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def wait(self, host: str):
+        """Block until a request to host is allowed"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        
+        if slot > now:
+            time.sleep(slot - now)
+
+class _TTLCache:
+    """Thread-safe LRU cache whose entries expire `ttl` seconds after being stored"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Any:
+        """Return the live value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def set(self, key: Hashable, value: Any):
+        """Store value for key, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+
 class CardScraper:
     """Web scraper for collecting credit card reward data"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        
-        # Setup logging
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
+        self.session = _SESSION
         
         # Rate limiting
-        self.request_delay = 2  # seconds between requests
+        self.request_delay = 2  # seconds between requests to the same host
+        self._rate_limiter = _HostRateLimiter(self.request_delay)
+        self._fetch_slots = threading.BoundedSemaphore(MAX_CONCURRENT_FETCHES)
+        
+        # Validators and bodies of fetched pages, persisted so unchanged pages
+        # can be revalidated with a conditional GET instead of re-downloaded
+        self.cache_path = os.path.join("data", "scraper_cache")
+        self._cache: Optional[shelve.Shelf] = None
+        self._cache_lock = threading.Lock()
+        
+        # Card details fetched in the last few minutes, keyed by (URL, card
+        # name) and served without even a conditional GET; callers must treat
+        # these as read-only, call clear() to force a refetch
+        self._recent_pages = _TTLCache(maxsize=256, ttl=300)
+        
+        # Worker processes for CPU-bound page parsing, started on first use
+        self._cpu_pool: Optional[ProcessPoolExecutor] = None
+        self._cpu_pool_lock = threading.Lock()
+    
+    def __del__(self):
+        self.close()
+    
+    def close(self):
+        """Shut down the parsing process pool and close the page cache, if they were opened"""
+        cpu_pool = getattr(self, '_cpu_pool', None)
+        if cpu_pool is not None:
+            self._cpu_pool = None
+            cpu_pool.shutdown(wait=False)
+        
+        cache_lock = getattr(self, '_cache_lock', None)
+        if cache_lock is not None:
+            with cache_lock:
+                if self._cache is not None:
+                    self._cache.close()
+                    self._cache = None
+    
+    def _get_cache(self) -> shelve.Shelf:
+        """Return the on-disk page cache, opening it on first use; the caller must hold _cache_lock"""
+        if self._cache is None:
+            self._cache = shelve.open(self.cache_path)
+        return self._cache
     
     def update_all_cards(self):
         """Update all credit card data from various sources"""
-        self.logger.info("Starting credit card data update...")
+        logger.info("Starting credit card data update...")
+        
+        issuer_scrapers = [
+            self._scrape_chase_cards,
+            self._scrape_discover_cards,
+            self._scrape_amex_cards
+        ]
+        
+        # One timestamp for the whole pass
+        scraped_at = iso_now()
         
         try:
-            # Update Chase cards
-            chase_cards = self._scrape_chase_cards()
-            
-            # Update Discover cards
-            discover_cards = self._scrape_discover_cards()
-            
-            # Update American Express cards
-            amex_cards = self._scrape_amex_cards()
+            # Scrape all issuers concurrently; each one is network-bound, so the
+            # update takes as long as the slowest issuer rather than their sum
+            with ThreadPoolExecutor(max_workers=len(issuer_scrapers)) as pool:
+                futures = [pool.submit(scrape, scraped_at) for scrape in issuer_scrapers]
+                
+                # Combine all card data, keeping issuer order
+                all_cards = [card for future in futures for card in future.result()]
             
-            # Combine all card data
-            all_cards = chase_cards + discover_cards + amex_cards
+            all_cards = self.validate_all(all_cards)
             
-            self.logger.info(f"Successfully updated {len(all_cards)} credit cards")
+            logger.info("Successfully updated %d credit cards", len(all_cards))
             return all_cards
             
         except Exception as e:
-            self.logger.error(f"Error updating card data: {str(e)}")
+            logger.error("Error updating card data: %s", e)
             raise
     
-    def _scrape_chase_cards(self) -> List[Dict[str, Any]]:
+    def _scrape_chase_cards(self, scraped_at: str) -> List[Dict[str, Any]]:
         """Scrape Chase credit card information"""
-        self.logger.info("Scraping Chase cards...")
-        
-        # In a real implementation, you would scrape from Chase's website
-        # For this demo, we'll return mock data that represents scraped information
-        
-        cards = [
-            {
-                "id": "chase_freedom_unlimited_updated",
-                "name": "Chase Freedom Unlimited",
-                "issuer": "Chase",
-                "type": "cashback",
-                "rewards": {
-                    "base_rate": 1.5,
-                    "categories": {
-                        "all_purchases": 1.5,
-                        "travel_through_chase": 5.0,
-                        "dining": 3.0,
-                        "drugstores": 3.0
-                    }
-                },
-                "annual_fee": 0,
-                "sign_up_bonus": {
-                    "amount": 200,
-                    "requirement": "Spend $500 in first 3 months"
-                },
-                "scraped_at": datetime.now().isoformat(),
-                "source_url": "https://creditcards.chase.com/rewards-credit-cards/sapphire/preferred"
-            },
-            {
-                "id": "chase_sapphire_preferred_updated",
-                "name": "Chase Sapphire Preferred",
-                "issuer": "Chase",
-                "type": "points",
-                "rewards": {
-                    "base_rate": 1,
-                    "categories": {
-                        "travel": 2,
-                        "dining": 2,
-                        "online_grocery": 2,
-                        "streaming": 2,
-                        "all_purchases": 1
-                    }
-                },
-                "annual_fee": 95,
-                "sign_up_bonus": {
-                    "amount": 60000,
-                    "requirement": "Spend $4,000 in first 3 months"
-                },
-                "scraped_at": datetime.now().isoformat(),
-                "source_url": "https://creditcards.chase.com/rewards-credit-cards/sapphire/preferred"
-            }
-        ]
+        logger.info("Scraping Chase cards...")
+        
+        # In a real implementation, you would scrape from Chase's website,
+        # fetching the card pages with self._fetch_cards(pages)
+        # For this demo, we'll return mock data from the bundled card catalog
+        
+        cards = [dict(card, scraped_at=scraped_at) for card in _load_catalog()["chase"]]
         
-        time.sleep(self.request_delay)
         return cards
     
-    def _scrape_discover_cards(self) -> List[Dict[str, Any]]:
+    def _scrape_discover_cards(self, scraped_at: str) -> List[Dict[str, Any]]:
         """Scrape Discover credit card information"""
-        self.logger.info("Scraping Discover cards...")
-        
-        # Mock data representing scraped Discover information
-        cards = [
-            {
-                "id": "discover_it_cash_back_updated",
-                "name": "Discover it Cash Back",
-                "issuer": "Discover",
-                "type": "cashback",
-                "rewards": {
-                    "base_rate": 1,
-                    "categories": {
-                        "rotating_5x": 5,
-                        "all_purchases": 1
-                    },
-                    "rotating_schedule": {
-                        "Q1": "gas_stations_grocery_stores",
-                        "Q2": "restaurants_paypal_gas_stations", 
-                        "Q3": "walmart_drugstores",
-                        "Q4": "amazon_target"
-                    }
-                },
-                "annual_fee": 0,
-                "sign_up_bonus": {
-                    "amount": "Double cash back first year",
-                    "requirement": "No minimum spend"
-                },
-                "scraped_at": datetime.now().isoformat(),
-                "source_url": "https://www.discover.com/credit-cards/cash-back/it-card.html"
-            }
-        ]
+        logger.info("Scraping Discover cards...")
+        
+        # Mock data representing scraped Discover information, from the card catalog
+        cards = [dict(card, scraped_at=scraped_at) for card in _load_catalog()["discover"]]
         
-        time.sleep(self.request_delay)
         return cards
     
-    def _scrape_amex_cards(self) -> List[Dict[str, Any]]:
+    def _scrape_amex_cards(self, scraped_at: str) -> List[Dict[str, Any]]:
         """Scrape American Express credit card information"""
-        self.logger.info("Scraping American Express cards...")
-        
-        # Mock data representing scraped Amex information
-        cards = [
-            {
-                "id": "amex_gold_updated",
-                "name": "American Express Gold Card",
-                "issuer": "American Express", 
-                "type": "points",
-                "rewards": {
-                    "base_rate": 1,
-                    "categories": {
-                        "dining": 4,
-                        "groceries": 4,
-                        "gas_stations": 3,
-                        "all_purchases": 1
-                    }
-                },
-                "annual_fee": 250,
-                "annual_credits": {
-                    "dining": 120,
-                    "uber": 120
-                },
-                "sign_up_bonus": {
-                    "amount": 60000,
-                    "requirement": "Spend $4,000 in first 6 months"
-                },
-                "scraped_at": datetime.now().isoformat(),
-                "source_url": "https://www.americanexpress.com/us/credit-cards/card/gold-card/"
-            },
-            {
-                "id": "amex_platinum_updated",
-                "name": "The Platinum Card from American Express",
-                "issuer": "American Express",
-                "type": "points", 
-                "rewards": {
-                    "base_rate": 1,
-                    "categories": {
-                        "airlines": 5,
-                        "hotels": 5,
-                        "all_purchases": 1
-                    }
-                },
-                "annual_fee": 695,
-                "annual_credits": {
-                    "airline": 200,
-                    "hotel": 200,
-                    "uber": 200,
-                    "saks": 100,
-                    "streaming": 240
-                },
-                "sign_up_bonus": {
-                    "amount": 100000,
-                    "requirement": "Spend $6,000 in first 6 months"
-                },
-                "scraped_at": datetime.now().isoformat(),
-                "source_url": "https://www.americanexpress.com/us/credit-cards/card/platinum/"
-            }
-        ]
+        logger.info("Scraping American Express cards...")
+        
+        # Mock data representing scraped Amex information, from the card catalog
+        cards = [dict(card, scraped_at=scraped_at) for card in _load_catalog()["amex"]]
         
-        time.sleep(self.request_delay)
         return cards
     
-    def _make_request(self, url: str) -> BeautifulSoup:
-        """Make a web request with error handling"""
+    def _fetch_cards(self, pages: List[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """Fetch several (url, card name) pages concurrently and extract their details, in order
+        
+        Pages that could not be fetched are returned as None.
+        """
+        if not pages:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(len(pages), MAX_CONCURRENT_FETCHES)) as pool:
+            return list(pool.map(lambda page: self._make_request(*page), pages))
+    
+    def _get_cpu_pool(self) -> ProcessPoolExecutor:
+        """Return the parsing process pool, starting it on first use
+        
+        Workers are started from a fork server (or spawned where that is not
+        available) rather than forked, since forking a multithreaded process
+        can deadlock the child on locks held by other threads.
+        """
+        with self._cpu_pool_lock:
+            if self._cpu_pool is None:
+                start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._cpu_pool = ProcessPoolExecutor(
+                    max_workers=min(os.cpu_count() or 1, MAX_PARSE_WORKERS),
+                    mp_context=multiprocessing.get_context(start_method)
+                )
+            return self._cpu_pool
+    
+    def _make_request(self, url: str, card_name: str) -> Optional[Dict[str, Any]]:
+        """Fetch a card page and extract its details in the parsing process pool
+        
+        Returns None if the page cannot be fetched or parsed; results are reused for five minutes.
+        """
+        key = (url, card_name)
+        details = self._recent_pages.get(key)
+        if details is not None:
+            return details
+        
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+            body = self._fetch(url)
+            if body is None:
+                return None
             
             # Parse HTML content
-            soup = BeautifulSoup(response.content, 'html.parser')
-            return soup
+            details = self._get_cpu_pool().submit(_parse_and_extract, body, card_name).result()
+            self._recent_pages.set(key, details)
+            return details
             
         except requests.RequestException as e:
-            self.logger.error(f"Request failed for {url}: {str(e)}")
-            raise
-        except Exception as e:
-            self.logger.error(f"Parsing failed for {url}: {str(e)}")
-            raise
+            logger.error("Request failed for %s: %s", url, e)
+            return None
+        except ValueError as e:
+            logger.error("Parsing failed for %s: %s", url, e)
+            return None
     
-    def _extract_reward_rates(self, soup: BeautifulSoup, card_name: str) -> Dict[str, Any]:
-        """Extract reward rates from parsed HTML"""
-        # This would contain the actual parsing logic for each card issuer's website
-        # Each issuer has different HTML structures, so this needs to be customized
+    def _fetch(self, url: str) -> Optional[bytes]:
+        """Fetch a page body using a conditional GET against the on-disk cache
+        
+        Returns None if the page is too large. The per-host rate limit is
+        waited out before taking a shared fetch slot, so a thread sleeping on
+        one issuer's spacing never holds a slot another issuer could use; the
+        slots cap open connections and buffered pages across all issuers.
+        """
+        with self._cache_lock:
+            cached = self._get_cache().get(url)
         
-        # Placeholder implementation
+        headers = {}
+        if cached is not None:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        self._rate_limiter.wait(urlparse(url).netloc)
+        with self._fetch_slots:
+            with self.session.get(url, headers=headers, stream=True, timeout=10) as response:
+                if response.status_code == 304 and cached is not None:
+                    return cached['body']
+                response.raise_for_status()
+                
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                body = self._read_body(url, response)
+        
+        if body is None or (not etag and not last_modified):
+            return body
+        
+        with self._cache_lock:
+            self._get_cache()[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'body': body
+            }
+        return body
+    
+    def _read_body(self, url: str, response: requests.Response) -> Optional[bytes]:
+        """Read a streamed response body, giving up past MAX_PAGE_BYTES
+        
+        Keeps peak memory per fetch bounded no matter how large the page is.
+        Returns None if the page is too large.
+        """
+        content_length = response.headers.get('Content-Length')
+        if content_length and content_length.isdigit() and int(content_length) > MAX_PAGE_BYTES:
+            logger.warning("Skipping %s: %s bytes exceeds page size limit", url, content_length)
+            return None
+        
+        chunks = []
+        total = 0
+        for chunk in response.iter_content(65536):
+            total += len(chunk)
+            if total > MAX_PAGE_BYTES:
+                logger.warning("Skipping %s: body exceeds page size limit", url)
+                return None
+            chunks.append(chunk)
+        return b''.join(chunks)
+    
+    @staticmethod
+    def _extract_reward_rates(tree: lxml.html.HtmlElement, card_name: str) -> Dict[str, Any]:
+        """Extract reward rates from parsed HTML
+        
+        Reads list items such as "3% cash back on dining" or "5x on travel"
+        and keys each rate by its category.
+        """
         rewards = {
             "base_rate": 1,
             "categories": {}
         }
         
+        for item in _RATE_XP(tree):
+            match = _RATE_RE.search(item.text_content())
+            if match:
+                category = _category_slug(match.group(2))
+                if category:
+                    rewards["categories"][sys.intern(category)] = float(match.group(1))
+        
         return rewards
     
-    def _extract_annual_fee(self, soup: BeautifulSoup) -> int:
+    @staticmethod
+    def _extract_annual_fee(tree: lxml.html.HtmlElement) -> int:
         """Extract annual fee information from parsed HTML"""
-        # Placeholder implementation
-        return 0
+        match = _MONEY_RE.search(''.join(_FEE_XP(tree)))
+        return int(match.group(1).replace(',', '')) if match else 0
     
-    def _extract_signup_bonus(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    @staticmethod
+    def _extract_signup_bonus(tree: lxml.html.HtmlElement) -> Dict[str, Any]:
         """Extract sign-up bonus information from parsed HTML"""
-        # Placeholder implementation
+        text = ' '.join(''.join(_BONUS_XP(tree)).split())
+        amount = _AMOUNT_RE.search(text)
+        requirement = _SPEND_RE.search(text)
         return {
-            "amount": 0,
-            "requirement": "No requirement found"
+            "amount": int(amount.group(1).replace(',', '')) if amount else 0,
+            "requirement": requirement.group(1) if requirement else "No requirement found"
         }
     
     def validate_scraped_data(self, card_data: Dict[str, Any]) -> bool:
         """Validate scraped credit card data"""
-        required_fields = ['id', 'name', 'issuer', 'type', 'rewards']
-        
-        for field in required_fields:
-            if field not in card_data:
-                self.logger.warning(f"Missing required field: {field}")
-                return False
+        missing = _REQUIRED_CARD_FIELDS - card_data.keys()
+        if missing:
+            logger.warning("Missing required fields: %s", ', '.join(sorted(missing)))
+            return False
         
         # Validate reward structure
         if 'base_rate' not in card_data['rewards']:
-            self.logger.warning("Missing base_rate in rewards")
+            logger.warning("Missing base_rate in rewards")
             return False
         
         return True
+    
+    def validate_all(self, cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Validate a batch of scraped cards in one pass, keeping only the valid ones"""
+        valid_cards = [card for card in cards if self.validate_scraped_data(card)]
+        
+        dropped = len(cards) - len(valid_cards)
+        if dropped:
+            logger.warning("Dropped %d invalid cards", dropped)
+        
+        return valid_cards
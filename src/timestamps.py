@@ -0,0 +1,15 @@
+import functools
+import time
+
+@functools.lru_cache(maxsize=1)
+def _format_timestamp(seconds: int) -> str:
+    """Format a Unix timestamp as an ISO 8601 UTC string"""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(seconds))
+
+def iso_now() -> str:
+    """Current UTC time as an ISO 8601 string with whole seconds and a Z suffix
+    
+    Used for every timestamp stored with card data, and formatted at most once
+    per second.
+    """
+    return _format_timestamp(int(time.time()))
@@ -440,11 +440,23 @@ class CardCompass {
             
             const data = await response.json();
             
-            if (data.success) {
+            if (!data.success) {
+                throw new Error(data.error);
+            }
+            
+            // The update runs in the background; poll until it finishes
+            let status = { success: true, status: 'running' };
+            while (status.success && status.status === 'running') {
+                await new Promise(resolve => setTimeout(resolve, 1000));
+                const statusResponse = await fetch(`/api/scrape/status/${data.job_id}`);
+                status = await statusResponse.json();
+            }
+            
+            if (status.success) {
                 await this.loadAvailableCards();
                 this.showSuccess('Card data updated successfully!');
             } else {
-                throw new Error(data.error);
+                throw new Error(status.error);
             }
         } catch (error) {
             console.error('Error updating card data:', error);
@@ -0,0 +1,17 @@
+"""WSGI entry point for running Card Compass under a production server
+
+    gunicorn -w 1 -k gthread --threads 8 -b 0.0.0.0:5001 wsgi:application
+
+Use a single worker process with a thread pool: user cards are held in
+memory by the DataManager, so multiple worker processes would each keep
+their own diverging copy.
+"""
+import os
+
+from app import app, data_manager
+
+# Ensure data files exist, as app.py does when run directly
+os.makedirs('data', exist_ok=True)
+data_manager.initialize_data_files()
+
+application = app